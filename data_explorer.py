@@ -4,9 +4,13 @@ Script para explorar dados minerados do GitHub
 """
 
 import os
+import hashlib
 import pandas as pd
-from collections import defaultdict
-import heapq
+import pyarrow as pa
+import pyarrow.csv as pv
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
 from graphs_project.matrix import MatrixGraph
 
 
@@ -14,38 +18,84 @@ class DataExplorer:
     def __init__(self):
         """Inicializa o explorador de dados"""
         self.graph = MatrixGraph(directed=True)
-        self.added_vertices = set()
+        self.added_vertices = {}  # {id do vértice: índice}
         self.data = None
-        self._pr_cache = {}
-        self._issue_cache = {}
+        self.total_comments = 0
+        self.total_reviews = 0
+        self._M = None
+        self._csr = None
+        self._bitrows = None
+        self._hop_cache = None
+        self._cache = {}  # resultados memoizados das análises pós-construção
+        self._ids = []  # categorias de usuários, indexadas pelo código int32
 
         with open('relatorio.txt', 'w', encoding='utf-8') as f:
             pass
 
+    # Tamanho dos blocos lidos de comments.csv/reviews.csv, que podem não
+    # caber inteiros em memória
+    CHUNKSIZE = 1_000_000
+
+    # Tabela de popcount por byte, para contar bits dos bitsets de adjacência
+    _POPCOUNT8 = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint16)
+
+    @staticmethod
+    def _read_arrow_csv(filepath, columns):
+        """Lê o CSV com o tokenizador multi-thread do Arrow e devolve um DataFrame"""
+        table = pv.read_csv(
+            filepath,
+            read_options=pv.ReadOptions(use_threads=True, block_size=8 << 20),
+            # Os CSVs minerados têm body/title com quebras de linha dentro
+            # da célula; sem esta opção o tokenizador rejeita o arquivo
+            parse_options=pv.ParseOptions(newlines_in_values=True),
+            convert_options=pv.ConvertOptions(
+                include_columns=columns,
+                # Células vazias viram null (não ""), preservando o
+                # fillna('unknown') e o filtro != '' do baseline
+                strings_can_be_null=True,
+                column_types={
+                    'state': pa.dictionary(pa.int32(), pa.string()),
+                    'author': pa.dictionary(pa.int32(), pa.string()),
+                    'number': pa.int64(),
+                }))
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+    def _load_cached(self, filepath, columns):
+        """
+        Mantém um cache Parquet em data/.cache para pular o parse do CSV
+        em execuções repetidas; invalida por mtime e pelo conjunto de colunas
+        """
+        cache_dir = os.path.join(os.path.dirname(filepath), '.cache')
+        col_hash = hashlib.md5(','.join(columns).encode()).hexdigest()[:8]
+        base = os.path.splitext(os.path.basename(filepath))[0]
+        cache = os.path.join(cache_dir, f'{base}-{col_hash}.parquet')
+
+        if os.path.exists(cache) and os.path.getmtime(cache) > os.path.getmtime(filepath):
+            return pd.read_parquet(cache, engine='pyarrow', dtype_backend='pyarrow')
+
+        df = self._read_arrow_csv(filepath, columns)
+        os.makedirs(cache_dir, exist_ok=True)
+        df.to_parquet(cache, compression='zstd', row_group_size=200_000)
+        return df
+
     def load_data(self):
-        """Carrega os dados dos arquivos CSV"""
+        """Carrega issues e PRs; comments e reviews são lidos em streaming ao montar o grafo"""
         try:
-            self.issues = pd.read_csv('data/issues.csv',
-                                      usecols=['author', 'state', 'closed_at', 'number'])
-            self.pull_requests = pd.read_csv('data/pull_requests.csv',
-                                             usecols=['author', 'state', 'merged_at', 'closed_at', 'number', 'merged'])
-            self.comments = pd.read_csv('data/comments.csv',
-                                        usecols=['author', 'issue_number'])
-            self.reviews = pd.read_csv('data/reviews.csv',
-                                       usecols=['pr_number', 'author', 'state'])
-
-            for df in [self.issues, self.pull_requests, self.comments, self.reviews]:
+            # O leitor CSV do Arrow tokeniza blocos em paralelo e já constrói
+            # buffers colunares contíguos, com author/state dicionarizados
+            self.issues = self._load_cached(
+                'data/issues.csv',
+                ['author', 'state', 'closed_at', 'number'])
+            self.pull_requests = self._load_cached(
+                'data/pull_requests.csv',
+                ['author', 'state', 'merged_at', 'closed_at', 'number', 'merged'])
+
+            for df in [self.issues, self.pull_requests]:
                 df['author'] = df['author'].fillna('unknown')
 
-            self._pr_cache = {row['number']: row for _,
-                              row in self.pull_requests.iterrows()}
-            self._issue_cache = {row['number']: row for _, row in self.issues.iterrows()}
-
             self.data = {
                 'issues': self.issues,
-                'pull_requests': self.pull_requests,
-                'comments': self.comments,
-                'reviews': self.reviews
+                'pull_requests': self.pull_requests
             }
         except Exception as e:
             print(f"Erro ao carregar dados: {str(e)}")
@@ -56,88 +106,162 @@ class DataExplorer:
         if not self.data:
             return
 
-        self._process_reviews_batch()
-        self._process_comments_batch()
-
-    def _process_reviews_batch(self):
-        """Processa reviews em lote"""
-        if 'pr_number' not in self.reviews.columns or 'author' not in self.reviews.columns:
-            print("Colunas necessárias não encontradas no arquivo de reviews")
-            return
-
-        interactions = []
-
-        for _, review in self.reviews.iterrows():
-            pr = self._pr_cache.get(review['pr_number'])
-            if pr is None:
-                continue
-
-            pr_author = pr['author']
-            review_author = review['author']
-
-            if pd.isna(pr_author) or pd.isna(review_author):
-                continue
-
-            interactions.append((
-                pr_author,
-                review_author,
-                1,
-                f"Review on PR #{review['pr_number']} ({review.get('state', 'unknown')})"
-            ))
-
-        self._add_batch_interactions(interactions)
-
-    def _process_comments_batch(self):
-        """Processa comentários em lote"""
-        if 'issue_number' not in self.comments.columns:
-            return
-
+        # Invalida os caches derivados de uma construção anterior
+        self._cache.clear()
+        self._M = None
+        self._csr = None
+        self._bitrows = None
+        self._hop_cache = None
+
+        # Cache persistente das arestas agregadas: se os CSVs não mudaram
+        # desde a última execução, pula toda a fase de parse + merge
+        cache_path = self._edge_cache_path()
+        if cache_path and os.path.exists(cache_path):
+            cached = np.load(cache_path)
+            self._ids = cached['ids'].tolist()
+            src_codes = cached['src']
+            tgt_codes = cached['tgt']
+            weights = cached['weights']
+            events = cached['events']
+            self.total_comments = int(cached['total_comments'])
+            self.total_reviews = int(cached['total_reviews'])
+        else:
+            edges = pd.concat(
+                [self._collect_reviews(), self._collect_comments()],
+                ignore_index=True)
+            edges = edges[edges['source'].notna() & edges['target'].notna()
+                          & (edges['source'] != '') & (edges['target'] != '')
+                          & (edges['source'] != edges['target'])]
+
+            # Agrega arestas paralelas antes de tocar no grafo: cada par
+            # (origem, destino) vira uma única inserção com o peso acumulado
+            edges = edges.groupby(['source', 'target'], sort=False).agg(
+                weight=('weight', 'sum'), events=('weight', 'size')).reset_index()
+
+            # Codificação categórica: cada usuário vira um código int32; as
+            # strings só reaparecem ao falar com o MatrixGraph e no relatório
+            n_edges = len(edges)
+            authors = pd.Categorical(pd.concat(
+                [edges['source'], edges['target']], ignore_index=True))
+            self._ids = authors.categories.tolist()
+            src_codes = authors.codes[:n_edges].astype(np.int32)
+            tgt_codes = authors.codes[n_edges:].astype(np.int32)
+            weights = edges['weight'].to_numpy(dtype=np.int32)
+            events = edges['events'].to_numpy(dtype=np.int32)
+
+            if cache_path:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                np.savez(cache_path, ids=np.array(self._ids),
+                         src=src_codes, tgt=tgt_codes,
+                         weights=weights, events=events,
+                         total_comments=self.total_comments,
+                         total_reviews=self.total_reviews)
+
+        labels = [f'{count} interactions' for count in events]
+
+        # Adicionar todos os vértices antes de qualquer aresta: com o n
+        # final conhecido, o MatrixGraph não precisa redimensionar a
+        # matriz a cada vértice novo que aparece no meio das arestas
+        self.added_vertices = {user: i for i, user in enumerate(self._ids)}
+        for user in self._ids:
+            self.graph.lib_add_vertex(user)
+            self.graph.lib_set_vertex_label(user, user)
+
+        self._add_batch_interactions(src_codes, tgt_codes, weights, labels)
+
+        # Cache da matriz como ndarray para as reduções vetorizadas
+        self._M = np.asarray(self.graph.matrix, dtype=np.int32)
+
+        # Representação esparsa paralela: O(n+m) em memória, pesos duplicados somados
+        n = len(self._ids)
+        self._csr = sp.csr_matrix(
+            (weights, (src_codes, tgt_codes)), shape=(n, n), dtype=np.int32)
+        self._csr.sum_duplicates()
+
+    @staticmethod
+    def _edge_cache_path():
+        """Caminho do cache de arestas, chaveado pelo mtime mais novo dos CSVs"""
+        csvs = ['data/issues.csv', 'data/pull_requests.csv',
+                'data/comments.csv', 'data/reviews.csv']
+        mtimes = [int(os.path.getmtime(p)) for p in csvs if os.path.exists(p)]
+        if not mtimes:
+            return None
+        return os.path.join('data', '.cache', f'graph_{max(mtimes)}.npz')
+
+    def _collect_edges(self, filepath, id_col, sources, missing_msg=None):
+        """
+        Coletor único de interações: lê o CSV em streaming, faz o join
+        vetorizado de cada bloco contra os autores de origem e devolve
+        o DataFrame de arestas mais o total de linhas processadas
+        """
+        try:
+            chunks = pd.read_csv(
+                filepath,
+                usecols=[id_col, 'author'],
+                dtype={id_col: 'int64', 'author': 'string'},
+                chunksize=self.CHUNKSIZE)
+        except ValueError:
+            if missing_msg:
+                print(missing_msg)
+            return self._empty_edge_frame(), 0
+
+        total = 0
         interactions = []
-
-        for _, comment in self.comments.iterrows():
-            issue_num = comment['issue_number']
-            source_row = self._issue_cache.get(
-                issue_num, self._pr_cache.get(issue_num))
-
-            if source_row is not None:
-                interactions.append((
-                    source_row['author'],
-                    comment['author'],
-                    1,
-                    f"Comment on #{comment['issue_number']}"
-                ))
-
-        self._add_batch_interactions(interactions)
-
-    def _add_batch_interactions(self, interactions):
-        """Adiciona um lote de interações ao grafo, acumulando pesos"""
-        ids = [v.id for v in self.graph.vertices]
-        index_map = {v_id: i for i, v_id in enumerate(ids)}
-
-        for source, target, weight, label in interactions:
-            if source == target or not source or not target:
-                continue
-
-            if source not in self.added_vertices:
-                self.graph.lib_add_vertex(source)
-                self.graph.lib_set_vertex_label(source, source)
-                self.added_vertices.add(source)
-
-            if target not in self.added_vertices:
-                self.graph.lib_add_vertex(target)
-                self.graph.lib_set_vertex_label(target, target)
-                self.added_vertices.add(target)
-
-            ids = [v.id for v in self.graph.vertices]
-            index_map = {v_id: i for i, v_id in enumerate(ids)}
-
-            i = index_map[source]
-            j = index_map[target]
+        for chunk in chunks:
+            chunk['author'] = chunk['author'].fillna('unknown')
+            total += len(chunk)
+
+            merged = chunk.merge(sources, on=id_col, how='inner')
+            merged = merged[merged['source_author'].notna()
+                            & merged['author'].notna()]
+
+            interactions.append(pd.DataFrame({
+                'source': merged['source_author'],
+                'target': merged['author'],
+                'weight': 1,
+            }))
+
+        if not interactions:
+            return self._empty_edge_frame(), total
+        return pd.concat(interactions, ignore_index=True), total
+
+    def _collect_reviews(self):
+        """Coleta as interações de reviews como DataFrame (origem, destino, peso)"""
+        pr_sources = self.pull_requests[['number', 'author']].rename(
+            columns={'number': 'pr_number', 'author': 'source_author'})
+        frame, self.total_reviews = self._collect_edges(
+            'data/reviews.csv', 'pr_number', pr_sources,
+            missing_msg="Colunas necessárias não encontradas no arquivo de reviews")
+        return frame
+
+    def _collect_comments(self):
+        """Coleta as interações de comentários como DataFrame (origem, destino, peso)"""
+        # Autores de issues têm prioridade sobre PRs com o mesmo número
+        sources = pd.concat([
+            self.issues[['number', 'author']],
+            self.pull_requests[['number', 'author']],
+        ]).drop_duplicates('number').rename(
+            columns={'number': 'issue_number', 'author': 'source_author'})
+
+        frame, self.total_comments = self._collect_edges(
+            'data/comments.csv', 'issue_number', sources)
+        return frame
+
+    @staticmethod
+    def _empty_edge_frame():
+        """DataFrame de arestas vazio com o esquema padrão"""
+        return pd.DataFrame(columns=['source', 'target', 'weight'])
+
+    def _add_batch_interactions(self, src_codes, tgt_codes, weights, labels):
+        """Insere as arestas no MatrixGraph a partir dos códigos int32 dos usuários"""
+        for i, j, weight, label in zip(src_codes, tgt_codes, weights, labels):
+            source = self._ids[i]
+            target = self._ids[j]
             current_weight = self.graph.matrix[i][j]
 
             if current_weight > 0:
                 self.graph.lib_set_edge_weight(
-                    weight=current_weight + weight,
+                    weight=int(current_weight + weight),
                     source_id=source,
                     target_id=target
                 )
@@ -145,104 +269,75 @@ class DataExplorer:
                 self.graph.lib_add_edge(
                     source_id=source,
                     target_id=target,
-                    weight=weight,
+                    weight=int(weight),
                     label=label
                 )
 
 
 
-    def calculate_user_scores(self):
-        """Calcula o grau total (entrada + saída) de cada usuário, desconsiderando pesos"""
-        user_scores = defaultdict(int)
-        ids = [v.id for v in self.graph.vertices]
-        n = len(ids)
+    def _matrix_array(self):
+        """Retorna a matriz de adjacência como ndarray (cacheado)"""
+        if getattr(self, '_M', None) is None:
+            self._M = np.asarray(self.graph.matrix, dtype=np.int32)
+        return self._M
 
-        for i in range(n):
-            vertex_id = ids[i]
-            out_degree = sum(1 for j in range(n) if self.graph.matrix[i][j] > 0)
-            in_degree = sum(1 for j in range(n) if self.graph.matrix[j][i] > 0)
-            user_scores[vertex_id] = in_degree + out_degree
+    def _degree_arrays(self):
+        """Graus binário e ponderado como arrays int64 indexados pelo código do usuário"""
+        if 'degree_arrays' not in self._cache:
+            M = self._matrix_array()
+            A = M > 0
+            self._cache['degree_arrays'] = (
+                (A.sum(axis=1) + A.sum(axis=0)).astype(np.int64),
+                (M.sum(axis=1, dtype=np.int64) + M.sum(axis=0, dtype=np.int64)),
+            )
+        return self._cache['degree_arrays']
 
-        return user_scores
+    def calculate_user_scores(self):
+        """Calcula o grau total (entrada + saída) de cada usuário, desconsiderando pesos"""
+        degrees, _ = self._degree_arrays()
+        return dict(zip(self._ids, degrees.tolist()))
 
+    def calculate_weighted_degrees(self):
+        """Calcula o grau ponderado de entrada + saída de cada vértice"""
+        _, weighted = self._degree_arrays()
+        return dict(zip(self._ids, weighted.tolist()))
 
 
+    def identify_natural_groups(self):
+        """Identifica grupos naturais (componentes fortemente conectados) via CSR esparso"""
+        if self._csr is None or self._csr.shape[0] == 0:
+            return []
 
-    def calculate_weighted_degrees(self):
-        """Calcula o grau ponderado de entrada + saída de cada vértice"""
-        weighted_degrees = {}
-        ids = [v.id for v in self.graph.vertices]
-        n = len(ids)
+        if 'natural_groups' not in self._cache:
+            n_components, labels = connected_components(
+                self._csr, directed=True, connection='strong')
 
-        for i in range(n):
-            vertex_id = ids[i]
-            out_degree = sum(self.graph.matrix[i][j] for j in range(n))
-            in_degree = sum(self.graph.matrix[j][i] for j in range(n))
-            weighted_degrees[vertex_id] = out_degree + in_degree
+            groups = [[] for _ in range(n_components)]
+            for i, label in enumerate(labels):
+                groups[label].append(self._ids[i])
 
-        return weighted_degrees
+            self._cache['natural_groups'] = groups
 
+        return self._cache['natural_groups']
 
-    def identify_natural_groups(self):
-        """Identifica grupos naturais (componentes fortemente conectados)"""
-        from collections import defaultdict, deque
-
-        ids = [v.id for v in self.graph.vertices]
-        index_map = {v.id: i for i, v in enumerate(self.graph.vertices)}
-        n = len(ids)
-
-        adj = [[] for _ in range(n)]
-        transpose = [[] for _ in range(n)]
-
-        for i in range(n):
-            for j in range(n):
-                if self.graph.matrix[i][j] > 0:
-                    adj[i].append(j)
-                    transpose[j].append(i)
-
-        visited = [False] * n
-        finish_stack = []
-
-        def dfs(v):
-            visited[v] = True
-            for nei in adj[v]:
-                if not visited[nei]:
-                    dfs(nei)
-            finish_stack.append(v)
-
-        def reverse_dfs(v, group):
-            visited[v] = True
-            group.append(ids[v])
-            for nei in transpose[v]:
-                if not visited[nei]:
-                    reverse_dfs(nei, group)
-
-        for i in range(n):
-            if not visited[i]:
-                dfs(i)
-
-        visited = [False] * n
-        groups = []
-
-        while finish_stack:
-            v = finish_stack.pop()
-            if not visited[v]:
-                group = []
-                reverse_dfs(v, group)
-                if group:
-                    groups.append(group)
-
-        return groups
+    @staticmethod
+    def _top_k(scores, k):
+        """Índices dos k maiores valores de um array, em ordem decrescente"""
+        k = min(k, len(scores))
+        if k == 0:
+            return np.empty(0, dtype=np.int64)
+        idx = np.argpartition(-scores, k - 1)[:k]
+        return idx[np.argsort(-scores[idx])]
 
     def identify_top_weighted_vertices(self, top_n=5):
         """Retorna os top_n vértices com maior grau ponderado"""
-        weighted_degrees = self.calculate_weighted_degrees()
-        return heapq.nlargest(top_n, weighted_degrees.items(), key=lambda x: x[1])
+        _, weighted = self._degree_arrays()
+        return [(self._ids[i], int(weighted[i])) for i in self._top_k(weighted, top_n)]
 
     def identify_influential_users(self, top_n=10):
         """Identifica os usuários mais influentes baseado no grau total"""
-        user_scores = self.calculate_user_scores()
-        return heapq.nlargest(top_n, user_scores.items(), key=lambda x: x[1])
+        degrees, _ = self._degree_arrays()
+        return [(self._ids[i], int(degrees[i])) for i in self._top_k(degrees, top_n)]
 
     # TOP 5 COMUNIDADES E NÍVEL DE INFLUÊNCIA
     # A fazer
@@ -253,52 +348,35 @@ class DataExplorer:
         if user_id not in self.added_vertices:
             return 0
 
-        ids = [v.id for v in self.graph.vertices]
-        index_map = {v.id: i for i, v in enumerate(self.graph.vertices)}
-        n = len(ids)
-
-        i = index_map.get(user_id)
-        if i is None:
-            return 0
+        i = self.added_vertices[user_id]
+        M = self._matrix_array()
 
-        neighbors = set()
+        # União vetorizada dos vizinhos de saída (linha) e entrada (coluna)
+        neighbors = (M[i] > 0) | (M[:, i] > 0)
+        neighbors[i] = False
 
-        # Vizinhos de saída
-        for j in range(n):
-            if self.graph.matrix[i][j] > 0:
-                neighbors.add(ids[j])
-
-        # Vizinhos de entrada
-        for j in range(n):
-            if self.graph.matrix[j][i] > 0:
-                neighbors.add(ids[j])
-
-        # Remove o próprio nó, se presente
-        neighbors.discard(user_id)
-
-        return len(neighbors)
+        return int(neighbors.sum())
     
+    def _bit_rows(self):
+        """Retorna as linhas da adjacência empacotadas como bitsets uint8 (cacheado)"""
+        if self._bitrows is None:
+            self._bitrows = np.packbits(self._matrix_array() > 0, axis=1)
+        return self._bitrows
+
     def calculate_group_connection_level(self, group):
         """Calcula o nível de conexão (em %) de uma comunidade (grupo fortemente conexo)"""
-        ids = [v.id for v in self.graph.vertices]
-        index_map = {v: i for i, v in enumerate(ids)}
-
         n = len(group)
         if n <= 1:
-            return 100.0  
+            return 100.0
 
-        real_connections = 0
-        possible_connections = n * (n - 1)
+        members = np.fromiter(
+            (self.added_vertices[user] for user in group), dtype=np.int32, count=n)
 
-        for i in range(n):
-            for j in range(n):
-                if i != j:
-                    src = index_map[group[i]]
-                    tgt = index_map[group[j]]
-                    if self.graph.matrix[src][tgt] > 0:
-                        real_connections += 1
+        # Fatia CSR linhas x colunas do grupo: só as arestas que realmente
+        # tocam o grupo são visitadas, em vez de n/8 bytes por membro
+        sub = self._csr[members][:, members]
 
-        return (real_connections / possible_connections) * 100
+        return (sub.nnz / (n * (n - 1))) * 100
 
 
     def calculate_graph_density(self):
@@ -307,115 +385,91 @@ class DataExplorer:
         if n <= 1:
             return 0.0
 
-        total_edges = 0
-        for i in range(n):
-            for j in range(n):
-                if self.graph.matrix[i][j] > 0:
-                    total_edges += 1
-
-        max_possible_edges = n * (n - 1) 
+        total_edges = self._csr.nnz if self._csr is not None else int(
+            self._POPCOUNT8[self._bit_rows()].sum())
+        max_possible_edges = n * (n - 1)
         return total_edges / max_possible_edges
 
+    def _hop_masks(self):
+        """Calcula (e cacheia) o alcance de 1, 2 e 3 saltos do grafo não direcionado"""
+        if self._hop_cache is None:
+            A = (self._csr + self._csr.T).astype(bool).tocsr()
+            A2 = (A @ A).tocsr()
+            A3 = (A2 @ A).tocsr()
+            self._hop_cache = (A, A2, A3)
+        return self._hop_cache
+
     # USUÁRIOS MAIS PRÓXIMOS QUE NÃO INTERAGEM DADO UM USUÁRIO
     def get_total_indirect_neighbors(self, user_id):
         """Retorna o número total de vizinhos indiretos de um usuário (nó), ou seja, aqueles a 2 ou 3 níveis de distância (sem ligação direta)."""
-        if user_id not in self.added_vertices:
-            return 0
-
-        ids = [v.id for v in self.graph.vertices]
-        index_map = {v.id: i for i, v in enumerate(self.graph.vertices)}
-        n = len(ids)
-
-        start = index_map.get(user_id)
-        if start is None:
+        if user_id not in self.added_vertices or self._csr is None:
             return 0
 
-        visited = set()
-        level = {start: 0}
-        queue = [(start, 0)]
+        i = self.added_vertices[user_id]
 
-        while queue:
-            current, depth = queue.pop(0)
-            if depth >= 3:
-                continue
+        # As potências da matriz esparsa substituem um BFS por usuário:
+        # A2|A3 alcança quem está a 2 ou 3 passos, e a máscara de vizinhos
+        # diretos remove quem já interage diretamente
+        A, A2, A3 = self._hop_masks()
+        direct = A[i].toarray().ravel()
+        reach = (A2[i].toarray() | A3[i].toarray()).ravel()
 
-            for neighbor in range(n):
-                if self.graph.matrix[current][neighbor] > 0 or self.graph.matrix[neighbor][current] > 0:
-                    if neighbor not in level:
-                        level[neighbor] = depth + 1
-                        queue.append((neighbor, depth + 1))
+        indirect = reach & ~direct
+        indirect[i] = False
 
-        # Coletar apenas os nós de nível 2 e 3
-        indirect_neighbors = {ids[node]
-                              for node, d in level.items() if d in (2, 3)}
+        return int(indirect.sum())
 
-        return len(indirect_neighbors)
+    # Usuários destacados nas seções de vizinhança do relatório
+    REPORT_USERS = ["seberg", "eric-wieser", "charris", "mattip", "rgommers"]
 
     # GERAÇÃO DE RELATÓRIO
     def generate_report(self):
         """Gera um relatório básico sobre os dados"""
-        report = "\nRELATÓRIO DE DADOS\n"
-        report += "="*50 + "\n"
+        parts = ["\nRELATÓRIO DE DADOS\n", "=" * 50 + "\n"]
 
         if not self.data:
-            report += "Nenhum dado disponível para gerar relatório\n"
+            parts.append("Nenhum dado disponível para gerar relatório\n")
             return
 
-        report += f"\nTotal de Issues: {len(self.issues)}\n"
-        report += f"Total de Pull Requests: {len(self.pull_requests)}\n"
-        report += f"Total de Comentários: {len(self.comments)}\n"
-        report += f"Total de Reviews: {len(self.reviews)}\n"
+        parts.append(f"\nTotal de Issues: {len(self.issues)}\n")
+        parts.append(f"Total de Pull Requests: {len(self.pull_requests)}\n")
+        parts.append(f"Total de Comentários: {self.total_comments}\n")
+        parts.append(f"Total de Reviews: {self.total_reviews}\n")
 
-        top_influential_users = heapq.nlargest(5, self.calculate_weighted_degrees().items(), key=lambda x: x[1])
+        top_influential_users = self.identify_top_weighted_vertices(5)
         if top_influential_users:
-            report += "\nTOP 5 USUÁRIOS COM MAIOR INFLUÊNCIA\n"
+            parts.append("\nTOP 5 USUÁRIOS COM MAIOR INFLUÊNCIA\n")
             for i, (user, _) in enumerate(top_influential_users, 1):
-                report += f"{i}. {user}\n"
-
+                parts.append(f"{i}. {user}\n")
 
         top_users = self.identify_influential_users()
         if top_users:
-            report += "\nTOP 10 USUÁRIOS QUE GERAM MAIOR FRAGMENTACAO:\n"
+            parts.append("\nTOP 10 USUÁRIOS QUE GERAM MAIOR FRAGMENTACAO:\n")
             for i, (user, score) in enumerate(top_users, 1):
-                report += f"{i}. {user}: Grau total = {score}\n"
+                parts.append(f"{i}. {user}: Grau total = {score}\n")
 
         natural_groups = self.identify_natural_groups()
         natural_groups.sort(key=len, reverse=True)
-        report += f"\nNúmero de Grupos Naturais (Componentes Fortemente Conexos): {len(natural_groups)}\n"
-        report += "\nTOP 5 MAIORES GRUPOS NATURAIS:\n"
+        parts.append(f"\nNúmero de Grupos Naturais (Componentes Fortemente Conexos): {len(natural_groups)}\n")
+        parts.append("\nTOP 5 MAIORES GRUPOS NATURAIS:\n")
         for i, group in enumerate(natural_groups[:5], 1):
             conn_level = self.calculate_group_connection_level(group)
-            report += f"{i}. ({len(group)} membros, conexão: {conn_level:.2f}%): {group}\n"
+            parts.append(f"{i}. ({len(group)} membros, conexão: {conn_level:.2f}%): {group}\n")
 
         graph_density = self.calculate_graph_density()
-        report += f"\nDENSIDADE DO GRAFO: {graph_density:.3f}\n"
-
-        report += "\nUSUÁRIOS MAIS PRÓXIMOS DADO UM USUÁRIO\n"
-        top1UserNeighbors = self.get_total_neighbors("seberg")
-        top2UserNeighbors = self.get_total_neighbors("eric-wieser")
-        top3UserNeighbors = self.get_total_neighbors("charris")
-        top4UserNeighbors = self.get_total_neighbors("mattip")
-        top5UserNeighbors = self.get_total_neighbors("rgommers")
-        report += f"1. Usuário seberg: {top1UserNeighbors} usuários mais próximos (vizinhos diretos)\n"
-        report += f"2. Usuário eric-wieser: {top2UserNeighbors} usuários mais próximos (vizinhos diretos)\n"
-        report += f"3. Usuário charris: {top3UserNeighbors} usuários mais próximos (vizinhos diretos)\n"
-        report += f"4. Usuário mattip: {top4UserNeighbors} usuários mais próximos (vizinhos diretos)\n"
-        report += f"5. Usuário rgommers: {top5UserNeighbors} usuários mais próximos (vizinhos diretos)\n"
-
-        report += "\nUSUÁRIOS MAIS PRÓXIMOS QUE NÃO INTERAGEM DADO UM USUÁRIO\n"
-        top1UserIndirectNeighbors = self.get_total_indirect_neighbors("seberg")
-        top2UserIndirectNeighbors = self.get_total_indirect_neighbors(
-            "eric-wieser")
-        top3UserIndirectNeighbors = self.get_total_indirect_neighbors(
-            "charris")
-        top4UserIndirectNeighbors = self.get_total_indirect_neighbors("mattip")
-        top5UserIndirectNeighbors = self.get_total_indirect_neighbors(
-            "rgommers")
-        report += f"1. Usuário seberg: {top1UserIndirectNeighbors} usuários mais próximos que não interagem diretamente\n"
-        report += f"2. Usuário eric-wieser: {top2UserIndirectNeighbors} usuários mais próximos que não interagem diretamente\n"
-        report += f"3. Usuário charris: {top3UserIndirectNeighbors} usuários mais próximos que não interagem diretamente\n"
-        report += f"4. Usuário mattip: {top4UserIndirectNeighbors} usuários mais próximos que não interagem diretamente\n"
-        report += f"5. Usuário rgommers: {top5UserIndirectNeighbors} usuários mais próximos que não interagem diretamente\n"
+        parts.append(f"\nDENSIDADE DO GRAFO: {graph_density:.3f}\n")
+
+        parts.append("\nUSUÁRIOS MAIS PRÓXIMOS DADO UM USUÁRIO\n")
+        for i, user in enumerate(self.REPORT_USERS, 1):
+            neighbors = self.get_total_neighbors(user)
+            parts.append(f"{i}. Usuário {user}: {neighbors} usuários mais próximos (vizinhos diretos)\n")
+
+        parts.append("\nUSUÁRIOS MAIS PRÓXIMOS QUE NÃO INTERAGEM DADO UM USUÁRIO\n")
+        for i, user in enumerate(self.REPORT_USERS, 1):
+            indirect = self.get_total_indirect_neighbors(user)
+            parts.append(f"{i}. Usuário {user}: {indirect} usuários mais próximos que não interagem diretamente\n")
+
+        report = "".join(parts)
 
         with open('relatorio.txt', 'w', encoding='utf-8') as f:
             f.write(report)
@@ -1,9 +1,12 @@
 import os
 import time
-import json
 import csv
+import base64
+import atexit
+import threading
+import orjson
 import requests
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Optional, Any
 from tqdm import tqdm
@@ -25,73 +28,196 @@ class GitHubMiner:
                  repo_owner: str = "numpy",
                  repo_name: str = "numpy",
                  requests_per_token: int = 2500,
-                 sleep_between_requests: float = 0.8,
-                 output_dir: str = "data"):
+                 output_dir: str = "data",
+                 include_body: bool = False):
         
         self.tokens = tokens
         self.repo_owner = repo_owner
         self.repo_name = repo_name
         self.requests_per_token = requests_per_token
-        self.sleep_between_requests = sleep_between_requests
         self.output_dir = output_dir
-        
-        self.current_token_index = 0
-        self.current_token_requests = 0
+        self.include_body = include_body
+        
+        # Um slot por token: cada um carrega seu próprio contador, o estado
+        # de rate limit reportado pelo GitHub (remaining/reset) e um token
+        # bucket local, para que requisições simultâneas consumam os N
+        # orçamentos em paralelo sem dormir um tempo fixo entre elas
+        now = time.time()
+        self._bucket_rate = requests_per_token / 3600.0  # recarga por segundo
+        self.token_slots = [
+            {"token": token, "requests": 0, "remaining": None, "reset": 0.0,
+             "bucket": float(requests_per_token), "last_refill": now}
+            for token in tokens]
+        self._slot_index = 0
+        self._token_lock = threading.Lock()
+        
+        # Escritores CSV abertos uma única vez por arquivo de saída
+        self._writers = {}
+        self._files = {}
+        self._writer_lock = threading.Lock()
+        atexit.register(self.close_writers)
         
         self.graphql_url = "https://api.github.com/graphql"
         
+        # Parte constante das variáveis GraphQL, copiada (não mutada) a
+        # cada requisição para continuar segura entre threads
+        self._base_variables = {"owner": repo_owner, "name": repo_name}
+        
         os.makedirs(self.output_dir, exist_ok=True)
         
-        self.headers = {
-            "Authorization": f"Bearer {self.get_current_token()}",
-            "Content-Type": "application/json"
-        }
+        # Sessão com pool de conexões keep-alive: evita refazer o
+        # handshake TCP+TLS com api.github.com a cada requisição
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=max(4, len(tokens) * 2),
+            pool_maxsize=32,
+            max_retries=0)
+        self.session.mount("https://", adapter)
+        
+        # Queries montadas uma única vez: o texto é constante por execução,
+        # então não há por que reconstruir a string a cada página minerada.
+        # Por padrão os corpos nem são pedidos: é o maior campo da resposta
+        # e o pipeline de grafos não o consome; com include_body=True o
+        # bodyText (texto puro, menor que o Markdown) entra na seleção
+        body_field = "bodyText" if include_body else ""
+        self._issues_query = self._build_paged_query(
+            "issues", self.ISSUE_PAGE_FIELDS.replace("%BODY%", body_field),
+            self.PAGES_PER_REQUEST)
+        self._prs_query = self._build_paged_query(
+            "pullRequests", self.PR_PAGE_FIELDS.replace("%BODY%", body_field),
+            self.PAGES_PER_REQUEST,
+            extra_args=", states: [OPEN, CLOSED, MERGED]")
         
         logging.info(f"GitHubMiner inicializado para {repo_owner}/{repo_name}")
         logging.info(f"Tokens disponíveis: {len(self.tokens)}")
         logging.info(f"Requests por token: {self.requests_per_token}")
+        logging.info(f"Recarga do token bucket: {self._bucket_rate:.3f} req/s por token")
         
-    def get_current_token(self) -> str:
-        return self.tokens[self.current_token_index]
+    # Margem de segurança: um token é considerado esgotado antes de
+    # remaining chegar a zero, evitando o 403 e sua penalidade
+    RATE_LIMIT_BUFFER = 50
     
-    def rotate_token(self):
-        self.current_token_index = (self.current_token_index + 1) % len(self.tokens)
-        self.current_token_requests = 0
-        self.headers["Authorization"] = f"Bearer {self.get_current_token()}"
-        logging.info(f"Token rotacionado para índice {self.current_token_index}")
+    def _slot_wait(self, slot: Dict, now: float) -> float:
+        """Quanto tempo falta para este slot voltar a ter orçamento"""
+        waits = [(1.0 - slot["bucket"]) / self._bucket_rate]
+        remaining = slot["remaining"]
+        if remaining is not None and remaining <= self.RATE_LIMIT_BUFFER:
+            waits.append(slot["reset"] - now)
+        return max(waits)
     
-    def check_rate_limit(self):
-        if self.current_token_requests >= self.requests_per_token:
-            logging.info(f"Rate limit atingido para token {self.current_token_index}")
-            self.rotate_token()
-        
-        time.sleep(self.sleep_between_requests)
-        self.current_token_requests += 1
+    def _next_slot(self) -> int:
+        """
+        Round-robin atômico dos tokens: cada slot mantém um token bucket
+        (capacidade requests_per_token, recarga proporcional por hora), de
+        modo que rajadas saem sem sleep fixo e a taxa média fica dentro do
+        orçamento. Slots que o GitHub reportou como esgotados são pulados;
+        se todos estiverem sem saldo, dorme só o necessário
+        """
+        while True:
+            now = time.time()
+            with self._token_lock:
+                n = len(self.token_slots)
+                for step in range(n):
+                    index = (self._slot_index + step) % n
+                    slot = self.token_slots[index]
+                    # Recarregar o bucket pelo tempo decorrido desde o último uso
+                    slot["bucket"] = min(
+                        float(self.requests_per_token),
+                        slot["bucket"] + (now - slot["last_refill"]) * self._bucket_rate)
+                    slot["last_refill"] = now
+                    remaining = slot["remaining"]
+                    header_ok = (remaining is None
+                                 or remaining > self.RATE_LIMIT_BUFFER
+                                 or slot["reset"] <= now)
+                    if header_ok and slot["bucket"] >= 1.0:
+                        slot["bucket"] -= 1.0
+                        self._slot_index = (index + 1) % n
+                        slot["requests"] += 1
+                        if slot["requests"] % self.requests_per_token == 0:
+                            logging.info(f"Token {index} atingiu {slot['requests']} requests")
+                        return index
+                wait = max(min(self._slot_wait(slot, now)
+                               for slot in self.token_slots), 0.05)
+            logging.info(f"Todos os tokens sem saldo. Aguardando {wait:.1f}s...")
+            time.sleep(wait)
+    
+    def _headers_for(self, index: int) -> Dict:
+        return {
+            "Authorization": f"Bearer {self.token_slots[index]['token']}",
+            "Content-Type": "application/json",
+            # Negociar também br/zstd: páginas de 200KB-1MB de JSON caem
+            # 5-10x no fio; o urllib3 descomprime de forma transparente
+            "Accept-Encoding": "gzip, deflate, br, zstd"
+        }
+    
+    def _record_rate_limit(self, index: int, headers) -> None:
+        """Atualiza o slot com o X-RateLimit-Remaining/Reset da resposta"""
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None:
+            return
+        with self._token_lock:
+            slot = self.token_slots[index]
+            slot["remaining"] = int(remaining)
+            slot["reset"] = float(reset) if reset else 0.0
+    
+    def _mark_rate_limited(self, index: int) -> None:
+        """Esgota o slot à força quando o GraphQL responde RATE_LIMITED"""
+        with self._token_lock:
+            slot = self.token_slots[index]
+            slot["remaining"] = 0
+            if slot["reset"] <= time.time():
+                slot["reset"] = time.time() + 60
+    
+    def total_requests(self) -> int:
+        """Total de requisições emitidas somado sobre todos os tokens"""
+        return sum(slot["requests"] for slot in self.token_slots)
     
     def make_graphql_request(self, query: str, variables: Dict = None) -> Dict:
-        self.check_rate_limit()
         
-        payload = {
+        # orjson serializa/parseia os payloads GraphQL bem mais rápido que
+        # o json da stdlib; o Content-Type já vai explícito nos headers
+        payload = orjson.dumps({
             "query": query,
             "variables": variables or {}
-        }
+        })
         
         max_retries = 3
         for attempt in range(max_retries):
+            slot_index = self._next_slot()
             try:
-                response = requests.post(
+                response = self.session.post(
                     self.graphql_url,
-                    headers=self.headers,
-                    json=payload,
+                    headers=self._headers_for(slot_index),
+                    data=payload,
                     timeout=30
                 )
                 
+                # Estado de rate limit vem em toda resposta: registrar antes
+                # de decidir qualquer coisa mantém a rotação sempre informada
+                self._record_rate_limit(slot_index, response.headers)
+                
                 if response.status_code == 200:
-                    data = response.json()
+                    data = orjson.loads(response.content)
                     if "errors" in data:
+                        # RATE_LIMITED chega como 200 + errors: esgotar o
+                        # token e repetir a mesma query com o próximo slot
+                        if any(err.get("type") == "RATE_LIMITED"
+                               for err in data["errors"]):
+                            logging.warning("Token rate-limited pelo GraphQL; rotacionando...")
+                            self._mark_rate_limited(slot_index)
+                            continue
                         logging.error(f"GraphQL errors: {data['errors']}")
                         return None
                     return data
+                elif response.status_code == 403:
+                    # Limite secundário: respeitar o Retry-After e esgotar o
+                    # slot para que a rotação escolha outro token
+                    retry_after = float(response.headers.get("Retry-After", 60))
+                    logging.warning(f"403 rate-limited. Aguardando {retry_after:.0f}s...")
+                    self._mark_rate_limited(slot_index)
+                    time.sleep(retry_after)
+                    continue
                 elif response.status_code in [502, 503, 504]:
                     # Erros temporários do servidor - tentar novamente
                     if attempt < max_retries - 1:
@@ -118,11 +244,15 @@ class GitHubMiner:
         
         return None
     
-    def get_issues_query(self) -> str:
-        return """
-        query($owner: String!, $name: String!, $cursor: String) {
-          repository(owner: $owner, name: $name) {
-            issues(first: 100, after: $cursor, orderBy: {field: CREATED_AT, direction: ASC}) {
+    # Quantas páginas com alias embutir em cada requisição HTTP
+    PAGES_PER_REQUEST = 3
+    # Itens por página: 100 é o máximo do GraphQL e, mesmo com as seleções
+    # aninhadas, 3 aliases x 100 itens ficam bem abaixo do limite de nós
+    PAGE_SIZE = 100
+    
+    # Seleção fundida: cada página de issues já traz os comentários
+    # aninhados, eliminando a segunda paginação que refazia number/title
+    ISSUE_PAGE_FIELDS = """
               pageInfo {
                 hasNextPage
                 endCursor
@@ -131,7 +261,7 @@ class GitHubMiner:
                 id
                 number
                 title
-                body
+                %BODY%
                 state
                 createdAt
                 updatedAt
@@ -149,23 +279,29 @@ class GitHubMiner:
                     name
                   }
                 }
-                comments {
+                reactions {
                   totalCount
                 }
-                reactions {
+                comments(first: 100) {
                   totalCount
+                  nodes {
+                    id
+                    %BODY%
+                    createdAt
+                    updatedAt
+                    author {
+                      login
+                    }
+                    reactions {
+                      totalCount
+                    }
+                  }
                 }
               }
-            }
-          }
-        }
-        """
+    """
     
-    def get_pull_requests_query(self) -> str:
-        return """
-        query($owner: String!, $name: String!, $cursor: String) {
-          repository(owner: $owner, name: $name) {
-            pullRequests(first: 100, after: $cursor, orderBy: {field: CREATED_AT, direction: ASC}, states: [OPEN, CLOSED, MERGED]) {
+    # Seleção fundida: cada página de PRs já traz os reviews aninhados
+    PR_PAGE_FIELDS = """
               pageInfo {
                 hasNextPage
                 endCursor
@@ -174,7 +310,7 @@ class GitHubMiner:
                 id
                 number
                 title
-                body
+                %BODY%
                 state
                 createdAt
                 updatedAt
@@ -200,66 +336,14 @@ class GitHubMiner:
                 reactions {
                   totalCount
                 }
-                reviews {
-                  totalCount
-                }
                 additions
                 deletions
                 changedFiles
-              }
-            }
-          }
-        }
-        """
-    
-    def get_comments_query(self) -> str:
-        return """
-        query($owner: String!, $name: String!, $cursor: String) {
-          repository(owner: $owner, name: $name) {
-            issues(first: 100, after: $cursor, orderBy: {field: CREATED_AT, direction: ASC}) {
-              pageInfo {
-                hasNextPage
-                endCursor
-              }
-              nodes {
-                number
-                title
-                comments(first: 100) {
-                  nodes {
-                    id
-                    body
-                    createdAt
-                    updatedAt
-                    author {
-                      login
-                    }
-                    reactions {
-                      totalCount
-                    }
-                  }
-                }
-              }
-            }
-          }
-        }
-        """
-    
-    def get_reviews_query(self) -> str:
-        return """
-        query($owner: String!, $name: String!, $cursor: String) {
-          repository(owner: $owner, name: $name) {
-            pullRequests(first: 50, after: $cursor, orderBy: {field: CREATED_AT, direction: ASC}) {
-              pageInfo {
-                hasNextPage
-                endCursor
-              }
-              nodes {
-                number
-                title
                 reviews(first: 100) {
+                  totalCount
                   nodes {
                     id
-                    body
+                    %BODY%
                     state
                     createdAt
                     updatedAt
@@ -272,250 +356,338 @@ class GitHubMiner:
                   }
                 }
               }
-            }
-          }
-        }
+    """
+    
+    # Esquemas fixos dos CSVs: cada linha minerada é uma tupla nesta ordem,
+    # evitando montar (e depois varrer) um dict por registro
+    ISSUE_FIELDS = ("id", "number", "title", "body", "state", "created_at",
+                    "updated_at", "closed_at", "author", "assignees", "labels",
+                    "comments_count", "reactions_count")
+    COMMENT_FIELDS = ("id", "body", "created_at", "updated_at", "author",
+                      "issue_number", "issue_title", "reactions_count")
+    PR_FIELDS = ("id", "number", "title", "body", "state", "created_at",
+                 "updated_at", "closed_at", "merged_at", "merged", "author",
+                 "assignees", "labels", "comments_count", "reactions_count",
+                 "reviews_count", "additions", "deletions", "changed_files")
+    REVIEW_FIELDS = ("id", "body", "state", "created_at", "updated_at",
+                     "author", "pr_number", "pr_title", "comments_count")
+    
+    @staticmethod
+    def _offset_cursor(offset: int) -> Optional[str]:
+        """Cursor determinístico 'cursor:N' usado pelas conexões ordenadas do GitHub"""
+        if offset <= 0:
+            return None
+        return base64.b64encode(f"cursor:{offset}".encode()).decode()
+    
+    def _build_paged_query(self, connection: str, fields: str, pages: int,
+                           extra_args: str = "") -> str:
+        """
+        Monta uma query com `pages` aliases (p0..pN-1) da mesma conexão,
+        cada um com seu cursor, amortizando o custo por requisição
         """
+        cursor_vars = ", ".join(f"$c{i}: String" for i in range(pages))
+        aliased = "\n".join(
+            f"p{i}: {connection}(first: {self.PAGE_SIZE}, after: $c{i}, "
+            f"orderBy: {{field: CREATED_AT, direction: ASC}}{extra_args}) {{{fields}}}"
+            for i in range(pages))
+        return (f"query($owner: String!, $name: String!, {cursor_vars}) {{\n"
+                f"  repository(owner: $owner, name: $name) {{\n{aliased}\n}}\n}}")
     
-    def save_to_csv(self, data: List[Dict], filename: str, mode: str = 'a'):  
+    def _submit_page_request(self, executor, query: str, offset: int):
+        """
+        Agenda a busca da leva de páginas que começa em `offset`. Como os
+        cursores são determinísticos, a leva seguinte pode ser pedida antes
+        mesmo de processarmos a atual (prefetch em double-buffer)
+        """
+        variables = dict(self._base_variables)
+        offset_cursor = self._offset_cursor
+        for i in range(self.PAGES_PER_REQUEST):
+            variables[f"c{i}"] = offset_cursor(offset + i * self.PAGE_SIZE)
+        return executor.submit(self.make_graphql_request, query, variables)
+    
+    def _checkpoint_path(self, name: str) -> str:
+        return os.path.join(self.output_dir, f"{name}.cursor.json")
+    
+    def _load_checkpoint(self, name: str) -> Optional[Dict]:
+        """Restaura o progresso de uma execução interrompida, se existir"""
+        path = self._checkpoint_path(name)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                return orjson.loads(f.read())
+        return None
+    
+    def _save_checkpoint(self, name: str, state: Dict):
+        """Grava o checkpoint de forma atômica (write em .tmp + os.replace)"""
+        path = self._checkpoint_path(name)
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(orjson.dumps(state))
+        os.replace(tmp, path)
+    
+    def save_to_csv(self, data: List[tuple], filename: str,
+                    fields: Optional[tuple] = None, mode: str = 'a'):
         if not data:
             return
-            
-        filepath = os.path.join(self.output_dir, filename)
-        file_exists = os.path.exists(filepath)
         
-        df = pd.DataFrame(data)
-        
-        df.to_csv(filepath, mode=mode, index=False, header=not file_exists, encoding='utf-8')
+        # Compatibilidade com chamadores que ainda passam dicts: a ordem de
+        # inserção das chaves vira o esquema posicional
+        if isinstance(data[0], dict):
+            fields = fields or tuple(data[0])
+            data = [tuple(row.values()) for row in data]
+        
+        # Um csv.writer por arquivo, aberto na primeira leva e mantido até o
+        # fim: linhas posicionais dispensam o hash de chaves do DictWriter
+        with self._writer_lock:
+            writer = self._writers.get(filename)
+            if writer is None:
+                filepath = os.path.join(self.output_dir, filename)
+                is_new = not os.path.exists(filepath) or os.path.getsize(filepath) == 0
+                handle = open(filepath, mode, buffering=1 << 20,
+                              newline='', encoding='utf-8')
+                writer = csv.writer(handle)
+                if is_new and fields:
+                    writer.writerow(fields)
+                self._writers[filename] = writer
+                self._files[filename] = handle
+        
+        writer.writerows(data)
         
         logging.info(f"Salvos {len(data)} registros em {filename}")
     
-    def mine_issues(self, save_batch_size: int = 1000) -> int:
-        logging.info("Iniciando mineração de Issues...")
+    def close_writers(self):
+        """Fecha os arquivos CSV abertos pelos escritores incrementais"""
+        with self._writer_lock:
+            for handle in self._files.values():
+                try:
+                    handle.close()
+                except OSError:
+                    pass
+            self._writers.clear()
+            self._files.clear()
+    
+    def mine_issues_and_comments(self, save_batch_size: int = 1000):
+        logging.info("Iniciando mineração de Issues + Comments...")
         
-        cursor = None
+        offset = 0
         total_issues = 0
-        batch_data = []
-        
-        while True:
-            variables = {
-                "owner": self.repo_owner,
-                "name": self.repo_name,
-                "cursor": cursor
-            }
-            
-            response = self.make_graphql_request(self.get_issues_query(), variables)
-            
-            if not response or not response.get("data"):
-                break
+        total_comments = 0
+        issue_batch = []
+        comment_batch = []
+        has_next = True
+        
+        # Retomar de onde a última execução parou, se houver checkpoint
+        state = self._load_checkpoint("issues")
+        if state:
+            offset = state["offset"]
+            total_issues = state["issues"]
+            total_comments = state["comments"]
+            logging.info(f"Retomando Issues do offset {offset}")
+        
+        # Double-buffer: enquanto a resposta atual é processada, a próxima
+        # leva já está na rede. Páginas curtas implicam hasNextPage=False,
+        # então o prefetch especulativo nunca avança além do fim real
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            future = self._submit_page_request(prefetcher, self._issues_query, offset)
+            while has_next:
+                response = future.result()
                 
-            issues_data = response["data"]["repository"]["issues"]
-            
-            for issue in issues_data["nodes"]:
-                issue_record = {
-                    "id": issue["id"],
-                    "number": issue["number"],
-                    "title": issue["title"],
-                    "body": issue["body"][:1000] if issue["body"] else "",  # Limitar tamanho
-                    "state": issue["state"],
-                    "created_at": issue["createdAt"],
-                    "updated_at": issue["updatedAt"],
-                    "closed_at": issue["closedAt"],
-                    "author": issue["author"]["login"] if issue["author"] else "",
-                    "assignees": ",".join([a["login"] for a in issue["assignees"]["nodes"]]),
-                    "labels": ",".join([l["name"] for l in issue["labels"]["nodes"]]),
-                    "comments_count": issue["comments"]["totalCount"],
-                    "reactions_count": issue["reactions"]["totalCount"]
-                }
-                batch_data.append(issue_record)
-                total_issues += 1
-            
-            if len(batch_data) >= save_batch_size:
-                self.save_to_csv(batch_data, "issues.csv")
-                batch_data = []
-            
-            page_info = issues_data["pageInfo"]
-            if not page_info["hasNextPage"]:
-                break
+                if not response or not response.get("data"):
+                    break
                 
-            cursor = page_info["endCursor"]
-            logging.info(f"Issues processadas: {total_issues}")
-        
-        if batch_data:
-            self.save_to_csv(batch_data, "issues.csv")
-        
-        logging.info(f"Mineração de Issues concluída. Total: {total_issues}")
-        return total_issues
-    
-    def mine_pull_requests(self, save_batch_size: int = 1000) -> int:
-        logging.info("Iniciando mineração de Pull Requests...")
-        
-        cursor = None
-        total_prs = 0
-        batch_data = []
-        
-        while True:
-            variables = {
-                "owner": self.repo_owner,
-                "name": self.repo_name,
-                "cursor": cursor
-            }
-            
-            response = self.make_graphql_request(self.get_pull_requests_query(), variables)
-            
-            if not response or not response.get("data"):
-                break
+                future = self._submit_page_request(
+                    prefetcher, self._issues_query,
+                    offset + self.PAGES_PER_REQUEST * self.PAGE_SIZE)
                 
-            prs_data = response["data"]["repository"]["pullRequests"]
+                pages = [response["data"]["repository"].get(f"p{i}")
+                         for i in range(self.PAGES_PER_REQUEST)]
+                issue_nodes = []
+                for page in pages:
+                    if page is None:
+                        has_next = False
+                        break
+                    issue_nodes.extend(page["nodes"])
+                    offset += len(page["nodes"])
+                    if not page["pageInfo"]["hasNextPage"]:
+                        has_next = False
+                        break
             
-            for pr in prs_data["nodes"]:
-                pr_record = {
-                    "id": pr["id"],
-                    "number": pr["number"],
-                    "title": pr["title"],
-                    "body": pr["body"][:1000] if pr["body"] else "",  # Limitar tamanho
-                    "state": pr["state"],
-                    "created_at": pr["createdAt"],
-                    "updated_at": pr["updatedAt"],
-                    "closed_at": pr["closedAt"],
-                    "merged_at": pr["mergedAt"],
-                    "merged": pr["merged"],
-                    "author": pr["author"]["login"] if pr["author"] else "",
-                    "assignees": ",".join([a["login"] for a in pr["assignees"]["nodes"]]),
-                    "labels": ",".join([l["name"] for l in pr["labels"]["nodes"]]),
-                    "comments_count": pr["comments"]["totalCount"],
-                    "reactions_count": pr["reactions"]["totalCount"],
-                    "reviews_count": pr["reviews"]["totalCount"],
-                    "additions": pr["additions"],
-                    "deletions": pr["deletions"],
-                    "changed_files": pr["changedFiles"]
-                }
-                batch_data.append(pr_record)
-                total_prs += 1
+                # Tuplas posicionais na ordem de ISSUE_FIELDS: sem dict por
+                # registro, e (x or "")[:1000] substitui o ternário de truncamento
+                issue_batch.extend((
+                    issue["id"],
+                    issue["number"],
+                    issue["title"],
+                    (issue.get("bodyText") or "")[:1000],  # Limitar tamanho
+                    issue["state"],
+                    issue["createdAt"],
+                    issue["updatedAt"],
+                    issue["closedAt"],
+                    (issue["author"] or {}).get("login", ""),
+                    ",".join([a["login"] for a in issue["assignees"]["nodes"]]),
+                    ",".join([l["name"] for l in issue["labels"]["nodes"]]),
+                    issue["comments"]["totalCount"],
+                    issue["reactions"]["totalCount"]
+                ) for issue in issue_nodes)
+                total_issues += len(issue_nodes)
             
-            if len(batch_data) >= save_batch_size:
-                self.save_to_csv(batch_data, "pull_requests.csv")
-                batch_data = []
+                # Comentários vêm aninhados na mesma página, sem requisição extra
+                for issue in issue_nodes:
+                    comments = issue["comments"]["nodes"]
+                    comment_batch.extend((
+                        comment["id"],
+                        (comment.get("bodyText") or "")[:1000],  # Limitar tamanho
+                        comment["createdAt"],
+                        comment["updatedAt"],
+                        (comment["author"] or {}).get("login", ""),
+                        issue["number"],
+                        issue["title"],
+                        comment["reactions"]["totalCount"]
+                    ) for comment in comments)
+                    total_comments += len(comments)
             
-            page_info = prs_data["pageInfo"]
-            if not page_info["hasNextPage"]:
-                break
-                
-            cursor = page_info["endCursor"]
-            logging.info(f"Pull Requests processados: {total_prs}")
-        
-        if batch_data:
-            self.save_to_csv(batch_data, "pull_requests.csv")
-        
-        logging.info(f"Mineração de Pull Requests concluída. Total: {total_prs}")
-        return total_prs
-    
-    def mine_comments(self, save_batch_size: int = 1000) -> int:
-        logging.info("Iniciando mineração de Comments...")
-        
-        cursor = None
-        total_comments = 0
-        batch_data = []
-        
-        while True:
-            variables = {
-                "owner": self.repo_owner,
-                "name": self.repo_name,
-                "cursor": cursor
-            }
-            
-            response = self.make_graphql_request(self.get_comments_query(), variables)
+                if len(issue_batch) >= save_batch_size:
+                    self.save_to_csv(issue_batch, "issues.csv", self.ISSUE_FIELDS)
+                    issue_batch = []
+                if len(comment_batch) >= save_batch_size:
+                    self.save_to_csv(comment_batch, "comments.csv", self.COMMENT_FIELDS)
+                    comment_batch = []
             
-            if not response or not response.get("data"):
-                break
-                
-            comments_data = response["data"]["repository"]["issues"]
-            
-            for issue in comments_data["nodes"]:
-                for comment in issue["comments"]["nodes"]:
-                    comment_record = {
-                        "id": comment["id"],
-                        "body": comment["body"][:1000] if comment["body"] else "",  # Limitar tamanho
-                        "created_at": comment["createdAt"],
-                        "updated_at": comment["updatedAt"],
-                        "author": comment["author"]["login"] if comment["author"] else "",
-                        "issue_number": issue["number"],
-                        "issue_title": issue["title"],
-                        "reactions_count": comment["reactions"]["totalCount"]
-                    }
-                    batch_data.append(comment_record)
-                    total_comments += 1
-
-            if len(batch_data) >= save_batch_size:
-                self.save_to_csv(batch_data, "comments.csv")
-                batch_data = []
+                # Só checkpointa quando tudo até aqui já está no CSV
+                if not issue_batch and not comment_batch:
+                    self._save_checkpoint("issues", {
+                        "offset": offset,
+                        "issues": total_issues,
+                        "comments": total_comments
+                    })
             
-            page_info = comments_data["pageInfo"]
-            if not page_info["hasNextPage"]:
-                break
-                
-            cursor = page_info["endCursor"]
-            logging.info(f"Comments processados: {total_comments}")
-        
-        if batch_data:
-            self.save_to_csv(batch_data, "comments.csv")
-        
-        logging.info(f"Mineração de Comments concluída. Total: {total_comments}")
-        return total_comments
+                logging.info(f"Issues processadas: {total_issues} (comments: {total_comments})")
+        
+        if issue_batch:
+            self.save_to_csv(issue_batch, "issues.csv", self.ISSUE_FIELDS)
+        if comment_batch:
+            self.save_to_csv(comment_batch, "comments.csv", self.COMMENT_FIELDS)
+        self._save_checkpoint("issues", {
+            "offset": offset,
+            "issues": total_issues,
+            "comments": total_comments
+        })
+        
+        logging.info(f"Mineração de Issues + Comments concluída. Issues: {total_issues}, Comments: {total_comments}")
+        return total_issues, total_comments
     
-    def mine_reviews(self, save_batch_size: int = 1000) -> int:
-        logging.info("Iniciando mineração de Reviews...")
+    def mine_pull_requests_and_reviews(self, save_batch_size: int = 1000):
+        logging.info("Iniciando mineração de Pull Requests + Reviews...")
         
-        cursor = None
+        offset = 0
+        total_prs = 0
         total_reviews = 0
-        batch_data = []
-        
-        while True:
-            variables = {
-                "owner": self.repo_owner,
-                "name": self.repo_name,
-                "cursor": cursor
-            }
+        pr_batch = []
+        review_batch = []
+        has_next = True
+        
+        # Retomar de onde a última execução parou, se houver checkpoint
+        state = self._load_checkpoint("pull_requests")
+        if state:
+            offset = state["offset"]
+            total_prs = state["prs"]
+            total_reviews = state["reviews"]
+            logging.info(f"Retomando Pull Requests do offset {offset}")
+        
+        # Mesmo double-buffer do minerador de issues
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            future = self._submit_page_request(prefetcher, self._prs_query, offset)
+            while has_next:
+                response = future.result()
+                
+                if not response or not response.get("data"):
+                    break
+                
+                future = self._submit_page_request(
+                    prefetcher, self._prs_query,
+                    offset + self.PAGES_PER_REQUEST * self.PAGE_SIZE)
+                
+                pages = [response["data"]["repository"].get(f"p{i}")
+                         for i in range(self.PAGES_PER_REQUEST)]
+                pr_nodes = []
+                for page in pages:
+                    if page is None:
+                        has_next = False
+                        break
+                    pr_nodes.extend(page["nodes"])
+                    offset += len(page["nodes"])
+                    if not page["pageInfo"]["hasNextPage"]:
+                        has_next = False
+                        break
             
-            response = self.make_graphql_request(self.get_reviews_query(), variables)
+                # Mesmas tuplas posicionais dos registros de issues (PR_FIELDS)
+                pr_batch.extend((
+                    pr["id"],
+                    pr["number"],
+                    pr["title"],
+                    (pr.get("bodyText") or "")[:1000],  # Limitar tamanho
+                    pr["state"],
+                    pr["createdAt"],
+                    pr["updatedAt"],
+                    pr["closedAt"],
+                    pr["mergedAt"],
+                    pr["merged"],
+                    (pr["author"] or {}).get("login", ""),
+                    ",".join([a["login"] for a in pr["assignees"]["nodes"]]),
+                    ",".join([l["name"] for l in pr["labels"]["nodes"]]),
+                    pr["comments"]["totalCount"],
+                    pr["reactions"]["totalCount"],
+                    pr["reviews"]["totalCount"],
+                    pr["additions"],
+                    pr["deletions"],
+                    pr["changedFiles"]
+                ) for pr in pr_nodes)
+                total_prs += len(pr_nodes)
             
-            if not response or not response.get("data"):
-                break
-                
-            prs_data = response["data"]["repository"]["pullRequests"]
+                # Reviews vêm aninhados na mesma página, sem requisição extra
+                for pr in pr_nodes:
+                    reviews = pr["reviews"]["nodes"]
+                    review_batch.extend((
+                        review["id"],
+                        (review.get("bodyText") or "")[:1000],  # Limitar tamanho
+                        review["state"],
+                        review["createdAt"],
+                        review["updatedAt"],
+                        (review["author"] or {}).get("login", ""),
+                        pr["number"],
+                        pr["title"],
+                        review["comments"]["totalCount"]
+                    ) for review in reviews)
+                    total_reviews += len(reviews)
             
-            for pr in prs_data["nodes"]:
-                for review in pr["reviews"]["nodes"]:
-                    review_record = {
-                        "id": review["id"],
-                        "body": review["body"][:1000] if review["body"] else "",  # Limitar tamanho
-                        "state": review["state"],
-                        "created_at": review["createdAt"],
-                        "updated_at": review["updatedAt"],
-                        "author": review["author"]["login"] if review["author"] else "",
-                        "pr_number": pr["number"],
-                        "pr_title": pr["title"],
-                        "comments_count": review["comments"]["totalCount"]
-                    }
-                    batch_data.append(review_record)
-                    total_reviews += 1
+                if len(pr_batch) >= save_batch_size:
+                    self.save_to_csv(pr_batch, "pull_requests.csv", self.PR_FIELDS)
+                    pr_batch = []
+                if len(review_batch) >= save_batch_size:
+                    self.save_to_csv(review_batch, "reviews.csv", self.REVIEW_FIELDS)
+                    review_batch = []
             
-            if len(batch_data) >= save_batch_size:
-                self.save_to_csv(batch_data, "reviews.csv")
-                batch_data = []
+                # Só checkpointa quando tudo até aqui já está no CSV
+                if not pr_batch and not review_batch:
+                    self._save_checkpoint("pull_requests", {
+                        "offset": offset,
+                        "prs": total_prs,
+                        "reviews": total_reviews
+                    })
             
-            page_info = prs_data["pageInfo"]
-            if not page_info["hasNextPage"]:
-                break
-                
-            cursor = page_info["endCursor"]
-            logging.info(f"Reviews processados: {total_reviews}")
-        
-        if batch_data:
-            self.save_to_csv(batch_data, "reviews.csv")
-        
-        logging.info(f"Mineração de Reviews concluída. Total: {total_reviews}")
-        return total_reviews
+                logging.info(f"Pull Requests processados: {total_prs} (reviews: {total_reviews})")
+        
+        if pr_batch:
+            self.save_to_csv(pr_batch, "pull_requests.csv", self.PR_FIELDS)
+        if review_batch:
+            self.save_to_csv(review_batch, "reviews.csv", self.REVIEW_FIELDS)
+        self._save_checkpoint("pull_requests", {
+            "offset": offset,
+            "prs": total_prs,
+            "reviews": total_reviews
+        })
+        
+        logging.info(f"Mineração de Pull Requests + Reviews concluída. PRs: {total_prs}, Reviews: {total_reviews}")
+        return total_prs, total_reviews
     
     def mine_all_data(self):
         start_time = datetime.now()
@@ -524,13 +696,13 @@ class GitHubMiner:
         results = {}
         
         try:
-            results["issues"] = self.mine_issues()
-            
-            results["pull_requests"] = self.mine_pull_requests()
-            
-            results["comments"] = self.mine_comments()
-            
-            results["reviews"] = self.mine_reviews()
+            # Duas sequências de paginação independentes (issues+comments e
+            # PRs+reviews), mineradas em paralelo para sobrepor a latência
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                issues_future = executor.submit(self.mine_issues_and_comments)
+                prs_future = executor.submit(self.mine_pull_requests_and_reviews)
+                results["issues"], results["comments"] = issues_future.result()
+                results["pull_requests"], results["reviews"] = prs_future.result()
             
         except Exception as e:
             logging.error(f"Erro durante a mineração: {e}")
@@ -545,6 +717,6 @@ class GitHubMiner:
         logging.info(f"Pull Requests: {results.get('pull_requests', 0)}")
         logging.info(f"Comments: {results.get('comments', 0)}")
         logging.info(f"Reviews: {results.get('reviews', 0)}")
-        logging.info(f"Total de requests: {self.current_token_requests}")
+        logging.info(f"Total de requests: {self.total_requests()}")
         
         return results 
\ No newline at end of file
@@ -1,9 +1,20 @@
+import os
+import numpy as np
 import pandas as pd
-from collections import defaultdict
+import pyarrow.parquet as pq
+from collections import Counter, defaultdict
 from graphs_project.matrix import MatrixGraph  # ou from graphs_project.list import ListGraph
 from graphs_project.list import ListGraph
 
 class GitHubGraphProcessor:
+    # Colunas que a construção de arestas realmente usa, por arquivo
+    USECOLS = {
+        'issues': ['number', 'author', 'state', 'closed_by'],
+        'pull_requests': ['number', 'author', 'state', 'merged', 'merged_by', 'closed_by'],
+        'comments': ['issue_number', 'author'],
+        'reviews': ['pr_number', 'author', 'state'],
+    }
+    
     def __init__(self, graph_type='matrix'):
         """
         Inicializa o processador de grafos
@@ -14,15 +25,36 @@ class GitHubGraphProcessor:
         else:
             self.graph = ListGraph(directed=True)
         
-        self.user_weights = defaultdict(int)  # Para armazenar pesos dos usuários
+        self.user_weights = Counter()  # Pesos dos usuários, derivados no export
         self.added_vertices = set()  # Para controlar vértices já adicionados
+        self._edge_index = {}  # {(source, target, label): peso acumulado}
+    
+    def _read_table(self, name):
+        """
+        Prefere um espelho Parquet ao CSV: leitura colunar com poda de
+        colunas (body/title nunca saem do disco); o espelho é gravado na
+        primeira leitura e revalidado por mtime
+        """
+        columns = self.USECOLS[name]
+        csv_path = f'data/{name}.csv'
+        parquet_path = f'data/{name}.parquet'
+        
+        if (os.path.exists(parquet_path)
+                and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)):
+            available = pq.read_schema(parquet_path).names
+            return pd.read_parquet(
+                parquet_path, columns=[col for col in columns if col in available])
+        
+        df = pd.read_csv(csv_path)
+        df.to_parquet(parquet_path)
+        return df[[col for col in columns if col in df.columns]]
     
     def load_data(self):
-        """Carrega todos os CSVs necessários"""
-        self.issues = pd.read_csv('data/issues.csv')
-        self.pull_requests = pd.read_csv('data/pull_requests.csv')
-        self.comments = pd.read_csv('data/comments.csv')
-        self.reviews = pd.read_csv('data/reviews.csv')
+        """Carrega todas as tabelas necessárias (Parquet quando disponível)"""
+        self.issues = self._read_table('issues')
+        self.pull_requests = self._read_table('pull_requests')
+        self.comments = self._read_table('comments')
+        self.reviews = self._read_table('reviews')
         
         # Pré-processamento básico
         for df in [self.issues, self.pull_requests, self.comments, self.reviews]:
@@ -31,9 +63,14 @@ class GitHubGraphProcessor:
                 df['closed_by'] = df['closed_by'].fillna('unknown')
             if 'merged_by' in df.columns:
                 df['merged_by'] = df['merged_by'].fillna('unknown')
+        
+        # Mapas number -> author para os joins vetorizados dos processadores
+        self._issue_author = dict(zip(self.issues['number'], self.issues['author']))
+        self._pr_author = dict(zip(self.pull_requests['number'], self.pull_requests['author']))
     
     def process_interactions(self):
         """Processa todas as interações conforme as regras definidas"""
+        # Fase 1: acumular todas as interações em dicts, sem tocar no grafo
         # 1. A abre Issue e B fecha
         self._process_issue_closures()
         
@@ -45,6 +82,14 @@ class GitHubGraphProcessor:
         
         # 4. B comenta na Issue/PR de A
         self._process_comments()
+        
+        # Fase 2: despejar o agregado no grafo, uma escrita por aresta única.
+        # Um único try/except aqui fora cobre falhas reais da biblioteca de
+        # grafos, sem pagar o custo de guardas por vértice/aresta no laço
+        try:
+            self._flush_graph()
+        except Exception as e:
+            print(f"Erro ao montar o grafo: {str(e)}")
     
     def _process_issue_closures(self):
         """Regra 1: A abre Issue e B fecha (weight=3)"""
@@ -52,13 +97,15 @@ class GitHubGraphProcessor:
             return
             
         closed_issues = self.issues[self.issues['state'] == 'closed']
-        for _, issue in closed_issues.iterrows():
-            if pd.notna(issue.get('closed_by')):
+        # itertuples entrega tuplas cruas, sem construir uma Series por linha
+        for author, closed_by, number in closed_issues[
+                ['author', 'closed_by', 'number']].itertuples(index=False, name=None):
+            if closed_by == closed_by:  # NaN != NaN
                 self._add_interaction(
-                    source=issue['author'],
-                    target=issue['closed_by'],
+                    source=author,
+                    target=closed_by,
                     weight=3,
-                    label=f"Closed issue #{issue['number']}"
+                    label=f"Closed issue #{number}"
                 )
     
     def _process_pr_merges(self):
@@ -67,135 +114,113 @@ class GitHubGraphProcessor:
             return
             
         closed_prs = self.pull_requests[self.pull_requests['state'] == 'closed']
-        for _, pr in closed_prs.iterrows():
-            closer = pr.get('merged_by') if pr.get('merged', False) else pr.get('closed_by', 'unknown')
-            if pd.notna(closer):
-                self._add_interaction(
-                    source=pr['author'],
-                    target=closer,
-                    weight=3,
-                    label=f"{'Merged' if pr.get('merged') else 'Closed'} PR #{pr['number']}"
-                )
+        # reindex materializa colunas ausentes como NaN, preservando o
+        # comportamento do pr.get(...) sem o custo de uma Series por linha
+        cols = closed_prs.reindex(
+            columns=['author', 'merged_by', 'closed_by', 'merged', 'number'])
+        merged = cols['merged'].fillna(False).to_numpy(dtype=bool)
+        
+        # Um único branch em C decide o closer de todas as linhas de uma vez
+        cols['closer'] = np.where(
+            merged, cols['merged_by'], cols['closed_by'].fillna('unknown'))
+        cols['merged'] = merged
+        cols = cols.dropna(subset=['closer'])
+        
+        for author, closer, merged, number in cols[
+                ['author', 'closer', 'merged', 'number']].itertuples(index=False, name=None):
+            self._add_interaction(
+                source=author,
+                target=closer,
+                weight=3,
+                label=f"{'Merged' if merged else 'Closed'} PR #{number}"
+            )
     
     def _process_reviews(self):
         """Regra 3: B aprova/solicita mudanças no PR de A (weight=2)"""
         if 'pr_number' not in self.reviews.columns or 'author' not in self.reviews.columns:
             print("Colunas necessárias não encontradas no arquivo de reviews")
             return
-            
-        for _, review in self.reviews.iterrows():
-            try:
-                # Verifica se o PR existe
-                pr = self.pull_requests[self.pull_requests['number'] == review['pr_number']]
-                if pr.empty:
-                    continue
-                    
-                pr_author = pr.iloc[0]['author']
-                review_author = review['author']
-                
-                if pd.isna(pr_author) or pd.isna(review_author):
-                    continue
-                    
-                self._add_interaction(
-                    source=pr_author,
-                    target=review_author,
-                    weight=2,
-                    label=f"Review on PR #{review['pr_number']} ({review.get('state', 'unknown')})"
-                )
-            except Exception as e:
-                print(f"Erro ao processar review {review.get('id', 'unknown')}: {str(e)}")
-                continue
+        
+        # Resolve o autor de cada PR com um map vetorizado (hash join em C),
+        # em vez de filtrar o DataFrame de PRs a cada review
+        df = self.reviews[['pr_number', 'author']].copy()
+        df['pr_author'] = df['pr_number'].map(self._pr_author)
+        df['state'] = self.reviews['state'] if 'state' in self.reviews.columns else 'unknown'
+        df = df.dropna(subset=['pr_author', 'author'])
+        
+        for pr_number, review_author, pr_author, state in df.itertuples(index=False, name=None):
+            self._add_interaction(
+                source=pr_author,
+                target=review_author,
+                weight=2,
+                label=f"Review on PR #{pr_number} ({state})"
+            )
     
     def _process_comments(self):
         """Regra 4: B comenta na Issue/PR de A (weight=2)"""
         if 'issue_number' not in self.comments.columns:
             return
-            
-        for _, comment in self.comments.iterrows():
-            # Verifica se é issue ou PR
-            if comment['issue_number'] in self.issues['number'].values:
-                source_df = self.issues
-            else:
-                source_df = self.pull_requests
-                
-            source_author = source_df[source_df['number'] == comment['issue_number']]['author']
-            
-            if not source_author.empty:
-                self._add_interaction(
-                    source=source_author.iloc[0],
-                    target=comment['author'],
-                    weight=2,
-                    label=f"Comment on #{comment['issue_number']}"
-                )
+        
+        # Issues têm prioridade sobre PRs de mesmo número, como antes
+        df = self.comments[['issue_number', 'author']].copy()
+        df['source'] = df['issue_number'].map(self._issue_author)
+        df['source'] = df['source'].fillna(df['issue_number'].map(self._pr_author))
+        df = df.dropna(subset=['source', 'author'])
+        
+        for issue_number, author, source in df.itertuples(index=False, name=None):
+            self._add_interaction(
+                source=source,
+                target=author,
+                weight=2,
+                label=f"Comment on #{issue_number}"
+            )
     
     def _add_interaction(self, source, target, weight, label):
-        """Adiciona uma interação ao grafo"""
+        """Acumula uma interação no agregado; o grafo só é tocado no flush"""
         if source == target or not source or not target:
             return  
         
-        if source not in self.added_vertices:
-            try:
-                self.graph.lib_add_vertex(source)
-                self.graph.lib_set_vertex_label(source, source)
-                self.added_vertices.add(source)
-            except Exception as e:
-                print(f"Erro ao adicionar vértice {source}: {str(e)}")
-                return
-                
-        if target not in self.added_vertices:
-            try:
-                self.graph.lib_add_vertex(target)
-                self.graph.lib_set_vertex_label(target, target)
-                self.added_vertices.add(target)
-            except Exception as e:
-                print(f"Erro ao adicionar vértice {target}: {str(e)}")
-                return
-
-        self.user_weights[source] += weight
-        self.user_weights[target] += weight
-        
-        edge_exists = False
-        for edge in self.graph.edges:
-            if (edge.sourceVertex.id == source and 
-                edge.targetVertex.id == target and 
-                edge.label == label):
-                edge_exists = True
-                break
-        
-        if edge_exists:
-            try:
-                current_weight = self._get_edge_weight(source, target, label)
-                self.graph.lib_set_edge_weight(
-                    weight=current_weight + weight,
-                    source_id=source,
-                    target_id=target,
-                    label=label
-                )
-            except Exception as e:
-                print(f"Erro ao atualizar aresta {source}->{target}: {str(e)}")
-        else:
-            try:
-                self.graph.lib_add_edge(
-                    source_id=source,
-                    target_id=target,
-                    weight=weight,
-                    label=label
-                )
-            except Exception as e:
-                print(f"Erro ao adicionar aresta {source}->{target}: {str(e)}")
+        key = (source, target, label)
+        self._edge_index[key] = self._edge_index.get(key, 0) + weight
     
-    def _get_edge_weight(self, source, target, label):
-        """Obtém o peso atual de uma aresta"""
-        for edge in self.graph.edges:
-            if (edge.sourceVertex.id == source and 
-                edge.targetVertex.id == target and 
-                edge.label == label):
-                return edge.weight
-        return 0
+    def _flush_graph(self):
+        """Cria vértices e arestas em lote a partir do agregado"""
+        # Métodos resolvidos uma vez fora dos laços: sem lookup de atributo
+        # por item e sem try/except por chamada (erros aqui são bugs reais,
+        # tratados de uma vez em process_interactions)
+        added = self.added_vertices
+        add_vertex = self.graph.lib_add_vertex
+        set_label = self.graph.lib_set_vertex_label
+        add_edge = self.graph.lib_add_edge
+        
+        vertices = set()
+        for source, target, _ in self._edge_index:
+            vertices.add(source)
+            vertices.add(target)
+        
+        for vertex in vertices:
+            if vertex not in added:
+                add_vertex(vertex)
+                set_label(vertex, vertex)
+                added.add(vertex)
+        
+        for (source, target, label), weight in self._edge_index.items():
+            add_edge(
+                source_id=source,
+                target_id=target,
+                weight=weight,
+                label=label
+            )
     
     def export_graph(self, filename):
         """Exporta o grafo para GEXF"""
-        # Aplica pesos acumulados aos vértices
+        # Pesos dos usuários derivados do agregado de arestas: uma passada
+        # por aresta única em vez de dois updates por interação no laço quente
+        self.user_weights.clear()
+        for (source, target, _), weight in self._edge_index.items():
+            self.user_weights[source] += weight
+            self.user_weights[target] += weight
+        
         for user, weight in self.user_weights.items():
             try:
                 self.graph.lib_set_vertex_weight(user, weight)
@@ -18,16 +18,9 @@ from dotenv import load_dotenv
 from github_miner import GitHubMiner
 
 def load_tokens_from_env() -> list:
-    """Carrega tokens do arquivo .env"""
-    tokens = []
-    
-    # Tentar carregar até 10 tokens
-    for i in range(1, 11):
-        token = os.getenv(f'GITHUB_TOKEN_{i}')
-        if token:
-            tokens.append(token)
-    
-    return tokens
+    """Carrega todos os tokens GITHUB_TOKEN_* em uma única varredura do ambiente"""
+    return [value for key, value in sorted(os.environ.items())
+            if key.startswith('GITHUB_TOKEN_') and value]
 
 def main():
     """Função principal"""
@@ -52,19 +45,16 @@ def main():
     repo_owner = os.getenv('REPO_OWNER', 'numpy')
     repo_name = os.getenv('REPO_NAME', 'numpy')
     requests_per_token = int(os.getenv('REQUESTS_PER_TOKEN', '2500'))
-    sleep_between_requests = float(os.getenv('SLEEP_BETWEEN_REQUESTS', '0.8'))
     
     print(f"🎯 Repositório: {repo_owner}/{repo_name}")
-    print(f"⚡ Requests por token: {requests_per_token}")
-    print(f"⏱️  Sleep entre requests: {sleep_between_requests}s")
+    print(f"⚡ Requests por token: {requests_per_token} (token bucket, sem sleep fixo)")
     
     # Criar minerador
     miner = GitHubMiner(
         tokens=tokens,
         repo_owner=repo_owner,
         repo_name=repo_name,
-        requests_per_token=requests_per_token,
-        sleep_between_requests=sleep_between_requests
+        requests_per_token=requests_per_token
     )
     
     # Executar mineração
@@ -1,8 +1,13 @@
 import os
 import sys
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import pandas as pd
 from dotenv import load_dotenv
 from github_miner import GitHubMiner
+from main import load_tokens_from_env
 
 def quick_test_mining():
     """Executa uma mineração de teste rápida"""
@@ -12,12 +17,8 @@ def quick_test_mining():
     # Carregar variáveis de ambiente
     load_dotenv()
     
-    # Carregar tokens
-    tokens = []
-    for i in range(1, 11):
-        token = os.getenv(f'GITHUB_TOKEN_{i}')
-        if token:
-            tokens.append(token)
+    # Carregar tokens (helper compartilhado com main.py)
+    tokens = load_tokens_from_env()
     
     if not tokens:
         print("❌ Erro: Nenhum token encontrado!")
@@ -31,7 +32,6 @@ def quick_test_mining():
         repo_owner="numpy",
         repo_name="numpy",
         requests_per_token=100,
-        sleep_between_requests=1.0,
         output_dir="test_data"
     )
     
@@ -39,18 +39,19 @@ def quick_test_mining():
     print("⚠️  Limitado a 100 requests por token para teste")
     
     try:
-        # Minerar apenas uma pequena amostra de cada tipo
-        print("\n1️⃣  Minerando Issues (amostra)...")
-        issues_count = mine_sample_issues(miner)
-        
-        print("\n2️⃣  Minerando Pull Requests (amostra)...")
-        prs_count = mine_sample_prs(miner)
-        
-        print("\n3️⃣  Minerando Comments (amostra)...")
-        comments_count = mine_sample_comments(miner)
-        
-        print("\n4️⃣  Minerando Reviews (amostra)...")
-        reviews_count = mine_sample_reviews(miner)
+        # As quatro amostras são independentes e I/O-bound: rodando em
+        # paralelo, o tempo total vira o da mais lenta, não a soma das quatro
+        print("\n⏳ Minerando as quatro amostras em paralelo...")
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            issues_future = executor.submit(mine_sample_issues, miner)
+            prs_future = executor.submit(mine_sample_prs, miner)
+            comments_future = executor.submit(mine_sample_comments, miner)
+            reviews_future = executor.submit(mine_sample_reviews, miner)
+            
+            issues_count = issues_future.result()
+            prs_count = prs_future.result()
+            comments_count = comments_future.result()
+            reviews_count = reviews_future.result()
         
         print("\n✅ Teste de mineração concluído!")
         print(f"📊 Resultados:")
@@ -66,200 +67,189 @@ def quick_test_mining():
         print(f"\n❌ Erro durante o teste: {e}")
         return False
 
+def _fetch_pages(miner, query, max_pages, checkpoint=None):
+    """
+    Busca até max_pages páginas em paralelo: os cursores de offset são
+    determinísticos, então as requisições saem todas de uma vez, cada uma
+    com um token diferente do rodízio do minerador. Com `checkpoint`, a
+    posição de paginação é persistida e uma execução interrompida retoma
+    de onde parou, sem repetir páginas já gravadas
+    """
+    per_request = miner.PAGES_PER_REQUEST
+    page_size = miner.PAGE_SIZE
+    
+    # Retomar do checkpoint, se houver: os offsets são determinísticos,
+    # então basta saber quantas páginas já foram consumidas
+    start_page = 0
+    if checkpoint:
+        state = miner._load_checkpoint(checkpoint)
+        if state:
+            start_page = state.get("pages", 0)
+            print(f"   Retomando {checkpoint} da página {start_page}...")
+    
+    remaining = max_pages - start_page
+    if remaining <= 0:
+        return []
+    n_requests = -(-remaining // per_request)  # ceil
+    workers = max(1, min(n_requests, len(miner.tokens)))
+    
+    pages = []
+    done = False
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            miner._submit_page_request(
+                executor, query, (start_page + i * per_request) * page_size)
+            for i in range(n_requests)
+        ]
+        for future in futures:
+            response = future.result()
+            if not response or not response.get("data"):
+                break
+            for i in range(per_request):
+                page = response["data"]["repository"].get(f"p{i}")
+                if page is None:
+                    done = True
+                    break
+                pages.append(page)
+                if len(pages) >= remaining or not page["pageInfo"]["hasNextPage"]:
+                    done = True
+                    break
+            if done:
+                break
+    
+    if checkpoint and pages:
+        miner._save_checkpoint(checkpoint, {"pages": start_page + len(pages)})
+    return pages
+
+def _open_sample_csv(miner, filename):
+    """
+    Abre o CSV da amostra uma única vez, com buffer de 1 MiB: cada página
+    é anexada assim que chega, sem acumular todos os frames na memória.
+    Modo append para compor com os checkpoints de retomada
+    """
+    return open(os.path.join(miner.output_dir, filename), 'a',
+                buffering=1 << 20, newline='', encoding='utf-8')
+
+def _start_csv_writer(miner, filename):
+    """
+    Escritor em thread própria, alimentado por uma fila de frames: o disco
+    grava a página N enquanto a thread principal já normaliza a N+1.
+    Enfileirar None encerra o escritor
+    """
+    frames_queue = queue.Queue(maxsize=4)
+    
+    def _drain():
+        with _open_sample_csv(miner, filename) as out:
+            write_header = out.tell() == 0
+            while True:
+                df = frames_queue.get()
+                if df is None:
+                    break
+                df.to_csv(out, index=False, header=write_header)
+                write_header = False
+    
+    worker = threading.Thread(target=_drain, daemon=True)
+    worker.start()
+    return frames_queue, worker
+
 def mine_sample_issues(miner, max_pages=2):
     """Minera uma amostra pequena de issues"""
-    cursor = None
     total_issues = 0
-    batch_data = []
-    pages_processed = 0
     
-    while pages_processed < max_pages:
-        variables = {
-            "owner": miner.repo_owner,
-            "name": miner.repo_name,
-            "cursor": cursor
-        }
-        
-        response = miner.make_graphql_request(miner.get_issues_query(), variables)
-        
-        if not response or not response.get("data"):
-            break
-            
-        issues_data = response["data"]["repository"]["issues"]
-        
-        for issue in issues_data["nodes"]:
-            issue_record = {
-                "id": issue["id"],
-                "number": issue["number"],
-                "title": issue["title"],
-                "state": issue["state"],
-                "created_at": issue["createdAt"],
-                "author": issue["author"]["login"] if issue["author"] else "",
-                "comments_count": issue["comments"]["totalCount"]
-            }
-            batch_data.append(issue_record)
-            total_issues += 1
-        
-        # Verificar se há mais páginas
-        page_info = issues_data["pageInfo"]
-        if not page_info["hasNextPage"]:
-            break
-            
-        cursor = page_info["endCursor"]
-        pages_processed += 1
-        print(f"   Processadas {total_issues} issues...")
-    
-    # Salvar dados
-    if batch_data:
-        miner.save_to_csv(batch_data, "sample_issues.csv")
+    frames_queue, writer = _start_csv_writer(miner, "sample_issues.csv")
+    try:
+        for page in _fetch_pages(miner, miner._issues_query, max_pages,
+                                 checkpoint="sample_issues"):
+            # json_normalize achata a página inteira em C, sem dict por linha
+            df = (pd.json_normalize(page["nodes"], sep='_')
+                  .reindex(columns=['id', 'number', 'title', 'state', 'createdAt',
+                                    'author_login', 'comments_totalCount'])
+                  .rename(columns={'createdAt': 'created_at',
+                                   'author_login': 'author',
+                                   'comments_totalCount': 'comments_count'}))
+            df['author'] = df['author'].fillna('')
+            frames_queue.put(df)
+            total_issues += len(df)
+            print(f"   Processadas {total_issues} issues...")
+    finally:
+        frames_queue.put(None)
+        writer.join()
     
     return total_issues
 
 def mine_sample_prs(miner, max_pages=2):
     """Minera uma amostra pequena de PRs"""
-    cursor = None
     total_prs = 0
-    batch_data = []
-    pages_processed = 0
     
-    while pages_processed < max_pages:
-        variables = {
-            "owner": miner.repo_owner,
-            "name": miner.repo_name,
-            "cursor": cursor
-        }
-        
-        response = miner.make_graphql_request(miner.get_pull_requests_query(), variables)
-        
-        if not response or not response.get("data"):
-            break
-            
-        prs_data = response["data"]["repository"]["pullRequests"]
-        
-        for pr in prs_data["nodes"]:
-            pr_record = {
-                "id": pr["id"],
-                "number": pr["number"],
-                "title": pr["title"],
-                "state": pr["state"],
-                "created_at": pr["createdAt"],
-                "merged": pr["merged"],
-                "author": pr["author"]["login"] if pr["author"] else "",
-                "additions": pr["additions"],
-                "deletions": pr["deletions"]
-            }
-            batch_data.append(pr_record)
-            total_prs += 1
-        
-        # Verificar se há mais páginas
-        page_info = prs_data["pageInfo"]
-        if not page_info["hasNextPage"]:
-            break
-            
-        cursor = page_info["endCursor"]
-        pages_processed += 1
-        print(f"   Processados {total_prs} PRs...")
-    
-    # Salvar dados
-    if batch_data:
-        miner.save_to_csv(batch_data, "sample_prs.csv")
+    frames_queue, writer = _start_csv_writer(miner, "sample_prs.csv")
+    try:
+        for page in _fetch_pages(miner, miner._prs_query, max_pages,
+                                 checkpoint="sample_prs"):
+            df = (pd.json_normalize(page["nodes"], sep='_')
+                  .reindex(columns=['id', 'number', 'title', 'state', 'createdAt',
+                                    'merged', 'author_login', 'additions', 'deletions'])
+                  .rename(columns={'createdAt': 'created_at',
+                                   'author_login': 'author'}))
+            df['author'] = df['author'].fillna('')
+            frames_queue.put(df)
+            total_prs += len(df)
+            print(f"   Processados {total_prs} PRs...")
+    finally:
+        frames_queue.put(None)
+        writer.join()
     
     return total_prs
 
 def mine_sample_comments(miner, max_pages=1):
-    """Minera uma amostra pequena de comments"""
-    cursor = None
+    """Minera uma amostra pequena de comments (aninhados nas issues)"""
     total_comments = 0
-    batch_data = []
-    pages_processed = 0
-    
-    while pages_processed < max_pages:
-        variables = {
-            "owner": miner.repo_owner,
-            "name": miner.repo_name,
-            "cursor": cursor
-        }
-        
-        response = miner.make_graphql_request(miner.get_comments_query(), variables)
-        
-        if not response or not response.get("data"):
-            break
-            
-        comments_data = response["data"]["repository"]["issues"]
-        
-        for issue in comments_data["nodes"]:
-            for comment in issue["comments"]["nodes"]:
-                comment_record = {
-                    "id": comment["id"],
-                    "created_at": comment["createdAt"],
-                    "author": comment["author"]["login"] if comment["author"] else "",
-                    "issue_number": issue["number"],
-                    "reactions_count": comment["reactions"]["totalCount"]
-                }
-                batch_data.append(comment_record)
-                total_comments += 1
-        
-        # Verificar se há mais páginas
-        page_info = comments_data["pageInfo"]
-        if not page_info["hasNextPage"]:
-            break
-            
-        cursor = page_info["endCursor"]
-        pages_processed += 1
-        print(f"   Processados {total_comments} comments...")
     
-    # Salvar dados
-    if batch_data:
-        miner.save_to_csv(batch_data, "sample_comments.csv")
+    frames_queue, writer = _start_csv_writer(miner, "sample_comments.csv")
+    try:
+        for page in _fetch_pages(miner, miner._issues_query, max_pages,
+                                 checkpoint="sample_comments"):
+            # record_path desaninha os comments e meta carrega o número da issue
+            df = (pd.json_normalize(page["nodes"],
+                                    record_path=['comments', 'nodes'],
+                                    meta=['number'], meta_prefix='issue_', sep='_')
+                  .reindex(columns=['id', 'createdAt', 'author_login',
+                                    'issue_number', 'reactions_totalCount'])
+                  .rename(columns={'createdAt': 'created_at',
+                                   'author_login': 'author',
+                                   'reactions_totalCount': 'reactions_count'}))
+            df['author'] = df['author'].fillna('')
+            frames_queue.put(df)
+            total_comments += len(df)
+            print(f"   Processados {total_comments} comments...")
+    finally:
+        frames_queue.put(None)
+        writer.join()
     
     return total_comments
 
 def mine_sample_reviews(miner, max_pages=1):
-    """Minera uma amostra pequena de reviews"""
-    cursor = None
+    """Minera uma amostra pequena de reviews (aninhados nos PRs)"""
     total_reviews = 0
-    batch_data = []
-    pages_processed = 0
     
-    while pages_processed < max_pages:
-        variables = {
-            "owner": miner.repo_owner,
-            "name": miner.repo_name,
-            "cursor": cursor
-        }
-        
-        response = miner.make_graphql_request(miner.get_reviews_query(), variables)
-        
-        if not response or not response.get("data"):
-            break
-            
-        prs_data = response["data"]["repository"]["pullRequests"]
-        
-        for pr in prs_data["nodes"]:
-            for review in pr["reviews"]["nodes"]:
-                review_record = {
-                    "id": review["id"],
-                    "state": review["state"],
-                    "created_at": review["createdAt"],
-                    "author": review["author"]["login"] if review["author"] else "",
-                    "pr_number": pr["number"],
-                    "comments_count": review["comments"]["totalCount"]
-                }
-                batch_data.append(review_record)
-                total_reviews += 1
-        
-        # Verificar se há mais páginas
-        page_info = prs_data["pageInfo"]
-        if not page_info["hasNextPage"]:
-            break
-            
-        cursor = page_info["endCursor"]
-        pages_processed += 1
-        print(f"   Processados {total_reviews} reviews...")
-    
-    # Salvar dados
-    if batch_data:
-        miner.save_to_csv(batch_data, "sample_reviews.csv")
+    frames_queue, writer = _start_csv_writer(miner, "sample_reviews.csv")
+    try:
+        for page in _fetch_pages(miner, miner._prs_query, max_pages,
+                                 checkpoint="sample_reviews"):
+            df = (pd.json_normalize(page["nodes"],
+                                    record_path=['reviews', 'nodes'],
+                                    meta=['number'], meta_prefix='pr_', sep='_')
+                  .reindex(columns=['id', 'state', 'createdAt', 'author_login',
+                                    'pr_number', 'comments_totalCount'])
+                  .rename(columns={'createdAt': 'created_at',
+                                   'author_login': 'author',
+                                   'comments_totalCount': 'comments_count'}))
+            df['author'] = df['author'].fillna('')
+            frames_queue.put(df)
+            total_reviews += len(df)
+            print(f"   Processados {total_reviews} reviews...")
+    finally:
+        frames_queue.put(None)
+        writer.join()
     
     return total_reviews
 